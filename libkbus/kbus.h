@@ -107,7 +107,7 @@ typedef int kbus_ksock_t;
  */
 
 // -------- TEXT AFTER THIS AUTOGENERATED - DO NOT EDIT --------
-// Autogenerated by extract_hdrs.py on 2010-11-16 (Tue 16 Nov 2010) at 09:56
+// Autogenerated by extract_hdrs.py on 2026-10-15 (Thu 15 Oct 2026) at 16:41
 /*
  * Open a Ksock.
  *
@@ -163,6 +163,27 @@ extern int kbus_ksock_bind(kbus_ksock_t         ksock,
                            const char          *name,
                            uint32_t             is_replier);
 
+/*
+ * Bind each of the given message names to the specified Ksock.
+ *
+ * `names` is an array of `count` message names, and `is_replier` is an array
+ * of the same length. If `is_replier[i]`, then `names[i]` is bound as a
+ * Replier, otherwise as a Listener.
+ *
+ * This is the same as calling `kbus_ksock_bind` for each name in turn, but
+ * saves the caller from crossing into this library once per binding (which
+ * is worth having when calling from another language).
+ *
+ * The bindings are made in order, stopping at the first that fails - any
+ * bindings before that will still have been made.
+ *
+ * Returns 0 for success, or a negative number (``-errno``) for failure.
+ */
+extern int kbus_ksock_bind_many(kbus_ksock_t         ksock,
+                                const char         **names,
+                                const uint32_t      *is_replier,
+                                uint32_t             count);
+
 /*
  * Unbind the given message name to the specified Ksock.
  *
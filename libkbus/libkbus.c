@@ -149,6 +149,43 @@ extern int kbus_ksock_bind(kbus_ksock_t         ksock,
     return rv;
 }
 
+/*
+ * Bind each of the given message names to the specified Ksock.
+ *
+ * `names` is an array of `count` message names, and `is_replier` is an array
+ * of the same length. If `is_replier[i]`, then `names[i]` is bound as a
+ * Replier, otherwise as a Listener.
+ *
+ * This is the same as calling `kbus_ksock_bind` for each name in turn, but
+ * saves the caller from crossing into this library once per binding (which
+ * is worth having when calling from another language).
+ *
+ * The bindings are made in order, stopping at the first that fails - any
+ * bindings before that will still have been made.
+ *
+ * Returns 0 for success, or a negative number (``-errno``) for failure.
+ */
+extern int kbus_ksock_bind_many(kbus_ksock_t         ksock,
+                                const char         **names,
+                                const uint32_t      *is_replier,
+                                uint32_t             count)
+{
+  int   rv;
+  uint32_t  ii;
+  kbus_bind_request_t   bind_request;
+
+  for (ii = 0; ii < count; ii++) {
+    bind_request.name = (char *) names[ii];
+    bind_request.name_len = strlen(names[ii]);
+    bind_request.is_replier = is_replier[ii];
+
+    rv = ioctl(ksock, KBUS_IOC_BIND, &bind_request);
+    if (rv < 0)
+      return -errno;
+  }
+  return 0;
+}
+
 /*
  * Unbind the given message name to the specified Ksock.
  *
@@ -536,25 +536,23 @@ static int setup_kbus(kbus_limpet_context_t *context,
         return rv;
     }
 
-    // Bind to proxy the requested message name (presumably a wildcard)
-    rv = kbus_ksock_bind(context->ksock, message_name, false);
-    if (rv) {
-        if (context->verbosity)
-            printf("Limpet %u: Error binding as listener for '%s': %d/%s\n",
-                   context->network_id, message_name, -rv, strerror(-rv));
-        return rv;
-    }
-
-    // Specifically bind for Replier Bind Event messages - since we're only
-    // getting single copies of messages, we don't mind if this overlaps
-    // what we just did.
-    rv = kbus_ksock_bind(context->ksock, KBUS_MSG_NAME_REPLIER_BIND_EVENT, false);
-    if (rv) {
-        if (context->verbosity)
-            printf("Limpet %u: Error binding as listener for '%s': %d/%s\n",
-                   context->network_id, KBUS_MSG_NAME_REPLIER_BIND_EVENT,
-               -rv, strerror(-rv));
-        return rv;
+    // Bind to proxy the requested message name (presumably a wildcard),
+    // and specifically bind for Replier Bind Event messages - since we're
+    // only getting single copies of messages, we don't mind if these overlap.
+    {
+        const char *names[2] = { message_name,
+                                 KBUS_MSG_NAME_REPLIER_BIND_EVENT };
+        const uint32_t is_replier[2] = { false, false };
+
+        rv = kbus_ksock_bind_many(context->ksock, names, is_replier, 2);
+        if (rv) {
+            if (context->verbosity)
+                printf("Limpet %u: Error binding as listener for '%s'"
+                       " and '%s': %d/%s\n", context->network_id,
+                       message_name, KBUS_MSG_NAME_REPLIER_BIND_EVENT,
+                       -rv, strerror(-rv));
+            return rv;
+        }
     }
 
     // And *ask* for Replier Bind Events to be issued
@@ -40,7 +40,10 @@ from __future__ import with_statement
 import fcntl
 import ctypes
 import array
+import os
+import re
 import select
+import struct
 
 from kbus.messages import MessageId, Message
 
@@ -75,6 +78,16 @@ def _IOWR(t, nr, size):                         # read and write
     return _IOC(_IOC_READ | _IOC_WRITE, t, nr, size)
 
 
+# How much longer than a message our read buffer needs to be, so that the
+# message datastructure can be copied straight out of it
+_READ_BUF_SLACK = 8
+
+# Read buffers given up by Ksocks that have been closed, ready for reuse by
+# the next Ksock that needs one. Programs (and tests) that open and close a
+# lot of Ksocks thus don't need to allocate a new buffer for each.
+_READ_BUF_POOL_MAX = 4
+_read_buf_pool = []
+
 class BindStruct(ctypes.Structure):
     """The datastucture we need to describe an IOC_BIND argument
     """
@@ -82,6 +95,19 @@ class BindStruct(ctypes.Structure):
                 ('len',        ctypes.c_uint32),
                 ('name',       ctypes.c_char_p)]
 
+# BindStruct, as a struct.Struct. Packing this is a lot cheaper than building
+# a new ctypes Structure, and fcntl.ioctl is just as happy with a string.
+_BIND_ARG = struct.Struct('IIP')
+
+def _pack_bind_arg(replier, name_len, name_ptr):
+    """Return an IOC_BIND/IOC_UNBIND argument, packed as a string.
+
+    'name_ptr' is a ctypes.c_char_p for the message name. The caller must
+    keep it alive until the ioctl has been done.
+    """
+    return _BIND_ARG.pack(replier, name_len,
+                          ctypes.cast(name_ptr, ctypes.c_void_p).value)
+
 class ReplierStruct(ctypes.Structure):
     """The datastucture we need to describe an IOC_REPLIER argument
     """
@@ -141,6 +167,19 @@ class Ksock(object):
         # Although Unix doesn't mind whether a file is opened with a 'b'
         # for binary, it is possible that some version of Python may
         self.fd = open(self.name, mode+'b')
+        # Our ioctls and writes go straight to the file descriptor, and it's
+        # cheaper to hand them an integer than to have them ask 'self.fd' for
+        # its fileno() every time
+        self._fileno = self.fd.fileno()
+        # KBUS assigns our Ksock id when we open the device, and it doesn't
+        # change thereafter, so we only need to ask for it once
+        self._cached_ksock_id = None
+        # Messages are read into this, which is reused from read to read
+        self._read_buf = None
+        # And similarly, our IOC_REPLIER argument is reused from call to call,
+        # as is the single word that IOC_NEXTMSG and IOC_LENLEFT return
+        self._replier_arg = ReplierStruct()
+        self._len_arg = array.array('I', [0])
 
     def __str__(self):
         if self.fd:
@@ -158,7 +197,13 @@ class Ksock(object):
     def close(self):
         ret = self.fd.close()
         self.fd = None
+        self._fileno = None
         self.mode = None
+        self._cached_ksock_id = None
+        if self._read_buf is not None:
+            if len(_read_buf_pool) < _READ_BUF_POOL_MAX:
+                _read_buf_pool.append(self._read_buf)
+            self._read_buf = None
         return ret
 
     def bind(self, name, replier=False):
@@ -167,36 +212,57 @@ class Ksock(object):
         If 'replier', then we are binding as the only fd that can reply to this
         message name.
         """
-        arg = BindStruct(replier, len(name), name)
-        fcntl.ioctl(self.fd, Ksock.IOC_BIND, arg)
+        self._bind_ioctl(Ksock.IOC_BIND, name, replier)
+
+    def bind_many(self, bindings):
+        """Bind each of a sequence of names to the file descriptor.
+
+        'bindings' is a sequence of (name, replier) tuples, each of which is
+        bound as by 'bind'. The names are bound in order, stopping at the
+        first that fails.
+        """
+        # KBUS doesn't (yet) have an ioctl to bind several names at once
+        for name, replier in bindings:
+            self._bind_ioctl(Ksock.IOC_BIND, name, replier)
 
     def unbind(self, name, replier=False):
         """Unbind the given name from the file descriptor.
 
         The arguments need to match the binding that we want to unbind.
         """
-        arg = BindStruct(replier, len(name), name)
-        fcntl.ioctl(self.fd, Ksock.IOC_UNBIND, arg)
+        self._bind_ioctl(Ksock.IOC_UNBIND, name, replier)
+
+    def _bind_ioctl(self, request, name, replier):
+        """Make an IOC_BIND or IOC_UNBIND 'request' for 'name'.
+        """
+        name_ptr = ctypes.c_char_p(name)
+        fcntl.ioctl(self._fileno, request,
+                    _pack_bind_arg(replier, len(name), name_ptr))
 
     def ksock_id(self):
         """Return the internal 'Ksock id' for this file descriptor.
+
+        The id cannot change whilst we are open, so KBUS is only asked for it
+        the first time.
         """
-        # Instead of using a ctypes.Structure, we can retrieve homogenious
-        # arrays of data using, well, arrays. This one is a bit minimalist.
-        # (Our devout hope, here and elsewhere, is that "I" means a 32-bit
-        # unsigned value on 32-bit *and* 64-bit platforms.)
-        id = array.array('I', [0])
-        fcntl.ioctl(self.fd, Ksock.IOC_KSOCKID, id, True)
-        return id[0]
+        if self._cached_ksock_id is None:
+            # Instead of using a ctypes.Structure, we can retrieve homogenious
+            # arrays of data using, well, arrays. This one is a bit minimalist.
+            # (Our devout hope, here and elsewhere, is that "I" means a 32-bit
+            # unsigned value on 32-bit *and* 64-bit platforms.)
+            id = array.array('I', [0])
+            fcntl.ioctl(self._fileno, Ksock.IOC_KSOCKID, id, True)
+            self._cached_ksock_id = id[0]
+        return self._cached_ksock_id
 
     def next_msg(self):
         """Say we want to start reading the next message.
 
         Returns the length of said message, or 0 if there is no next message.
         """
-        id = array.array('I', [0])
-        fcntl.ioctl(self.fd, Ksock.IOC_NEXTMSG, id, True)
-        return id[0]
+        arg = self._len_arg
+        fcntl.ioctl(self._fileno, Ksock.IOC_NEXTMSG, arg, True)
+        return arg[0]
 
     def len_left(self):
         """Return how many bytes of the current message are still to be read.
@@ -204,9 +270,9 @@ class Ksock(object):
         Returns 0 if there is no current message (i.e., 'next_msg()' has not
         been called), or if there are no bytes left.
         """
-        id = array.array('I', [0])
-        fcntl.ioctl(self.fd, Ksock.IOC_LENLEFT, id, True)
-        return id[0]
+        arg = self._len_arg
+        fcntl.ioctl(self._fileno, Ksock.IOC_LENLEFT, arg, True)
+        return arg[0]
 
     def send(self):
         """Send the last written message.
@@ -219,7 +285,7 @@ class Ksock(object):
         Raises IOError with errno ENOMSG if there was no message to send.
         """
         arg = array.array('I', [0, 0])
-        fcntl.ioctl(self.fd, Ksock.IOC_SEND, arg);
+        fcntl.ioctl(self._fileno, Ksock.IOC_SEND, arg);
         return MessageId(arg[0], arg[1])
 
     def discard(self):
@@ -230,7 +296,7 @@ class Ksock(object):
         written (for instance, because 'send' has already been called).
         be sent.
         """
-        fcntl.ioctl(self.fd, Ksock.IOC_DISCARD, 0);
+        fcntl.ioctl(self._fileno, Ksock.IOC_DISCARD, 0);
 
     def last_msg_id(self):
         """Return the id of the last message written on this file descriptor.
@@ -238,7 +304,7 @@ class Ksock(object):
         Returns 0 before any messages have been sent.
         """
         id = array.array('I', [0, 0])
-        fcntl.ioctl(self.fd, Ksock.IOC_LASTSENT, id, True)
+        fcntl.ioctl(self._fileno, Ksock.IOC_LASTSENT, id, True)
         return MessageId(id[0], id[1])
 
     def find_replier(self, name):
@@ -246,8 +312,11 @@ class Ksock(object):
 
         Returns None if there was no replier, otherwise the replier's id.
         """
-        arg = ReplierStruct(0, len(name), name)
-        retval = fcntl.ioctl(self.fd, Ksock.IOC_REPLIER, arg);
+        arg = self._replier_arg
+        arg.return_id = 0
+        arg.len = len(name)
+        arg.name = name
+        retval = fcntl.ioctl(self._fileno, Ksock.IOC_REPLIER, arg);
         if retval:
             return arg.return_id
         else:
@@ -257,7 +326,7 @@ class Ksock(object):
         """Return the number of messages that can be queued on this Ksock.
         """
         id = array.array('I', [0])
-        fcntl.ioctl(self.fd, Ksock.IOC_MAXMSGS, id, True)
+        fcntl.ioctl(self._fileno, Ksock.IOC_MAXMSGS, id, True)
         return id[0]
 
     def set_max_messages(self, count):
@@ -273,14 +342,14 @@ class Ksock(object):
         Ksock.
         """
         id = array.array('I', [count])
-        fcntl.ioctl(self.fd, Ksock.IOC_MAXMSGS, id, True)
+        fcntl.ioctl(self._fileno, Ksock.IOC_MAXMSGS, id, True)
         return id[0]
 
     def num_messages(self):
         """Return the number of messages that are queued on this Ksock.
         """
         id = array.array('I', [0])
-        fcntl.ioctl(self.fd, Ksock.IOC_NUMMSGS, id, True)
+        fcntl.ioctl(self._fileno, Ksock.IOC_NUMMSGS, id, True)
         return id[0]
 
     def num_unreplied_to(self):
@@ -291,7 +360,7 @@ class Ksock(object):
         Reply.
         """
         id = array.array('I', [0])
-        fcntl.ioctl(self.fd, Ksock.IOC_UNREPLIEDTO, id, True)
+        fcntl.ioctl(self._fileno, Ksock.IOC_UNREPLIEDTO, id, True)
         return id[0]
 
     def want_messages_once(self, only_once=False, just_ask=False):
@@ -326,7 +395,7 @@ class Ksock(object):
         else:
             val = 0
         id = array.array('I', [val])
-        fcntl.ioctl(self.fd, Ksock.IOC_MSGONLYONCE, id, True)
+        fcntl.ioctl(self._fileno, Ksock.IOC_MSGONLYONCE, id, True)
         return id[0]
 
     def kernel_module_verbose(self, verbose=True, just_ask=False):
@@ -357,7 +426,7 @@ class Ksock(object):
         else:
             val = 0
         id = array.array('I', [val])
-        fcntl.ioctl(self.fd, Ksock.IOC_VERBOSE, id, True)
+        fcntl.ioctl(self._fileno, Ksock.IOC_VERBOSE, id, True)
         return id[0]
 
     def new_device(self):
@@ -369,7 +438,7 @@ class Ksock(object):
         Returns the new device number (<n>).
         """
         id = array.array('I', [0])
-        fcntl.ioctl(self.fd, Ksock.IOC_NEWDEVICE, id, True)
+        fcntl.ioctl(self._fileno, Ksock.IOC_NEWDEVICE, id, True)
         return id[0]
 
     def report_replier_binds(self, report_events=True, just_ask=False):
@@ -412,17 +481,17 @@ class Ksock(object):
         else:
             val = 0
         id = array.array('I', [val])
-        fcntl.ioctl(self.fd, Ksock.IOC_REPORTREPLIERBINDS, id, True)
+        fcntl.ioctl(self._fileno, Ksock.IOC_REPORTREPLIERBINDS, id, True)
         return id[0]
 
     def write_msg(self, message):
         """Write a Message. Doesn't send it.
         """
-        # Message data is held in an array.array, and arrays know
-        # how to write themselves out
-        self.fd.write(message.msg)
-        # But we are responsible for flushing
-        self.fd.flush()
+        # The message datastructure supports the buffer interface, so we can
+        # hand it straight to os.write (a "pointy" message's name and data
+        # are fetched by KBUS itself, so that's still one write)
+        data = message.msg
+        self._write(data, ctypes.sizeof(data))
 
     def send_msg(self, message):
         """Write a Message, and then send it.
@@ -434,14 +503,27 @@ class Ksock(object):
         return self.send()
 
     def write_data(self, data):
-        """Write out (and flush) some data.
+        """Write out some data, immediately.
 
         Does not send it, does not imply that it is all of a message
         (although clearly it should form *some* of a message).
         """
-        ret = self.fd.write(data)
-        self.fd.flush()
-        return ret
+        self._write(data, len(data))
+
+    def _write(self, data, length):
+        """Write 'length' bytes of 'data' directly to our file descriptor.
+
+        That's a single system call (as a rule), rather than copying the
+        data into the file object's buffer and then flushing it.
+        """
+        fileno = self._fileno
+        try:
+            written = os.write(fileno, data)
+            while written < length:
+                written += os.write(fileno, buffer(data, written))
+        except OSError, e:
+            # Be consistent with the errors the file object would give
+            raise IOError(e.errno, e.strerror)
 
     def read_msg(self, length):
         """Read a Message of length 'length' bytes.
@@ -455,9 +537,9 @@ class Ksock(object):
 
         Returns None if there was nothing to be read.
         """
-        data = self.fd.read(length)
-        if data:
-            return Message.from_bytes(data)
+        buf, count = self._read_into_buffer(length)
+        if count:
+            return Message.from_bytes(buf, count)
         else:
             return None
 
@@ -470,12 +552,40 @@ class Ksock(object):
 
         Returns None if there was nothing to be read.
         """
-        data = self.fd.read(self.next_msg())
-        if data:
-            return Message.from_bytes(data)
+        buf, count = self._read_into_buffer(self.next_msg())
+        if count:
+            return Message.from_bytes(buf, count)
         else:
             return None
 
+    def _read_into_buffer(self, length):
+        """Read up to 'length' bytes into our read buffer.
+
+        The same buffer is used for each read, so that we don't need to
+        allocate a new string for every message we read - the Message we
+        construct from it takes its own copy of the data anyway.
+
+        Returns (buffer, count), where 'count' is the number of bytes actually
+        read. The buffer will generally be longer than that, and anything
+        after the first 'count' bytes is left over from earlier reads.
+        """
+        if length == 0:
+            return None, 0
+        buf = self._read_buf
+        if buf is None:
+            # Another thread may empty the pool under our feet, so don't
+            # just check it has something in it first
+            try:
+                buf = self._read_buf = _read_buf_pool.pop()
+            except IndexError:
+                pass
+        # An "entire" message datastructure may have padding at its end
+        # (for instance, on a 64-bit machine), so leave room for that
+        if buf is None or len(buf) < length + _READ_BUF_SLACK:
+            buf = self._read_buf = bytearray(length + _READ_BUF_SLACK)
+        count = self.fd.readinto(memoryview(buf)[:length])
+        return buf, count
+
     def wait_for_msg(self, timeout=None):
         """Wait for the next Message.
 
@@ -549,6 +659,14 @@ class Ksock(object):
         """
         return self.fd.fileno()
 
+# A line from /proc/kbus/bindings, as described in 'read_bindings' below.
+# Comment lines start with '#', and so do not match.
+_BINDING_LINE_RE = re.compile(r'^ *(\d+): +(\d+) +(\d+) +(\S) +(\S+)$',
+                              re.MULTILINE)
+
+# 'R' means a Replier, 'L' (just) a Listener
+_REPLIER_FLAG = {'R':True, 'L':False}
+
 def read_bindings(names):
     """Read the bindings from /proc/kbus/bindings, and return a list
 
@@ -575,24 +693,20 @@ def read_bindings(names):
           (12, True, '$.William' ]
     """
     f = open('/proc/kbus/bindings')
-    l = f.readlines()
+    data = f.read()
     f.close()
     bindings = []
-    for line in l:
-        if line[0] == '#':
-            continue
+    # Using findall means the regular expression engine hands us back tuples
+    # of strings directly, rather than a match object per line
+    for dev, id, pid, rep, name in _BINDING_LINE_RE.findall(data):
         # 'dev' is the device index (default is 0, may be 0..9 depending on how
         # many /dev/kbus<N> devices there are).
         # For the moment, we're going to ignore it.
-        dev, id, pid, rep, name = line.split()
         id = int(id)
-        if id in names:
-            id = names[int(id)]
-        if rep == 'R':          # Replier
-            rep = True
-        elif rep == 'L':        # (just a) Listener
-            rep = False
-        else:
+        id = names.get(id, id)
+        try:
+            rep = _REPLIER_FLAG[rep]
+        except KeyError:
             raise ValueError("Got replier '%c' when expecting 'R' or 'L'"%rep)
         bindings.append((id, rep, name))
     return bindings
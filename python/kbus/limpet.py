@@ -188,46 +188,50 @@ class LimpetKsock(Ksock):
 
     def bind(self, *args):
         """Not meaningful for this class."""
-        raise NotImplemented('bind method is not relevant to LimpetKsock')
+        raise NotImplementedError('bind method is not relevant to LimpetKsock')
+
+    def bind_many(self, *args):
+        """Not meaningful for this class."""
+        raise NotImplementedError('bind_many method is not relevant to LimpetKsock')
 
     def unbind(self, *args):
         """Not meaningful for this class."""
-        raise NotImplemented('unbind method is not relevant to LimpetKsock')
+        raise NotImplementedError('unbind method is not relevant to LimpetKsock')
 
     def len_left(self):
         """Not meaningful for this class.
 
         We only support reading an entire message in one go.
         """
-        raise NotImplemented('len_left method is not relevant to LimpetKsock')
+        raise NotImplementedError('len_left method is not relevant to LimpetKsock')
 
     def discard(self):
         """Not meaningful for this class.
 
         We only support reading an entire message in one go.
         """
-        raise NotImplemented('discard method is not relevant to LimpetKsock')
+        raise NotImplementedError('discard method is not relevant to LimpetKsock')
 
     def want_messages_once(self, only_once=False, just_ask=False):
         """Not meaningful for this class.
 
         We require that this be set, and do not want the user to change it
         """
-        raise NotImplemented('want_messages_once method is not relevant to LimpetKsock')
+        raise NotImplementedError('want_messages_once method is not relevant to LimpetKsock')
 
     def report_replier_binds(self, report_events=True, just_ask=False):
         """Not meaningful for this class.
 
         We require that this be set, and do not want the user to change it
         """
-        raise NotImplemented('report_replier_binds method is not relevant to LimpetKsock')
+        raise NotImplementedError('report_replier_binds method is not relevant to LimpetKsock')
 
     def write_msg(self, message):
         """Not meaningful for this class.
 
         We only support writing and sending an entire message in one go.
         """
-        raise NotImplemented('write_msg method is not relevant to LimpetKsock')
+        raise NotImplementedError('write_msg method is not relevant to LimpetKsock')
 
     def send_msg(self, message):
         """Write a Message (from the other Limpet) to our Ksock, and send it.
@@ -253,7 +257,7 @@ class LimpetKsock(Ksock):
 
         We only support writing an entire message in one go.
         """
-        raise NotImplemented('write_data method is not relevant to LimpetKsock')
+        raise NotImplementedError('write_data method is not relevant to LimpetKsock')
 
     def read_msg(self, length):
         """Read a Message of length 'length' bytes.
@@ -314,7 +318,7 @@ class LimpetKsock(Ksock):
 
         We only support reading an entire message in one go.
         """
-        raise NotImplemented('read_data method is not relevant to LimpetKsock')
+        raise NotImplementedError('read_data method is not relevant to LimpetKsock')
 
     def _sort_out_network_ids(self, msg):
         # If KBUS gave us a message with an unset network id, then it is
@@ -682,8 +686,15 @@ def unserialise_message_header(data):
     Returns (name_len, data_len, array)
     """
     array = _struct_from_bytes(_SerialisedMessageHeaderType, data)
+    return _unserialise_message_header_array(array)
+
+def _unserialise_message_header_array(array):
+    """Unserialise a message header array (as read from the network) in place.
+
+    Returns (name_len, data_len, array)
+    """
     for ii, item in enumerate(array):
-        array[ii] = ntohl(array[ii])
+        array[ii] = ntohl(item)
     return array[13], array[14], array
 
 def convert_ReplierBindEvent_data_from_network(data, data_len):
@@ -766,6 +777,10 @@ class LimpetExample(object):
         self.sock = sock
         self.verbosity = verbosity
 
+        # Message headers from our pair are received straight into this,
+        # rather than into a new string each time
+        self._header = _SerialisedMessageHeaderType()
+
         # We don't know the network id of our Limpet pair yet
         self.other_network_id = None
 
@@ -849,12 +864,16 @@ class LimpetExample(object):
         """
 
         # First, read the message header
-        header = self.sock.recv(_SERIALISED_MESSAGE_HEADER_LEN*4,
-                                socket.MSG_WAITALL)
-        if header == '':
+        header = self._header
+        count = self.sock.recv_into(header, ctypes.sizeof(header),
+                                    socket.MSG_WAITALL)
+        if count == 0:
             raise OtherLimpetGoneAway()
+        elif count != ctypes.sizeof(header):
+            raise GiveUp('Message header is %d bytes,'
+                         ' not %d'%(count,ctypes.sizeof(header)))
 
-        name_len, data_len, array = unserialise_message_header(header)
+        name_len, data_len, array = _unserialise_message_header_array(header)
 
         if array[0] != Message.START_GUARD:
             raise GiveUp('Message data start guard is %08x,'
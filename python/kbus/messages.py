@@ -101,17 +101,8 @@ class MessageId(ctypes.Structure):
     def __cmp__(self, other):
         if not isinstance(other, MessageId):
             return NotImplemented
-        if self.network_id == other.network_id:
-            if self.serial_num == other.serial_num:
-                return 0
-            elif self.serial_num < other.serial_num:
-                return -1
-            else:
-                return 1
-        elif self.network_id < other.network_id:
-            return -1
-        else:
-            return 1
+        return cmp((self.network_id, self.serial_num),
+                   (other.network_id, other.serial_num))
 
     def __add__(self, other):
         if not isinstance(other, int):
@@ -149,17 +140,8 @@ class OrigFrom(ctypes.Structure):
     def __cmp__(self, other):
         if not isinstance(other, OrigFrom):
             return NotImplemented
-        if self.network_id == other.network_id:
-            if self.local_id == other.local_id:
-                return 0
-            elif self.local_id < other.local_id:
-                return -1
-            else:
-                return 1
-        elif self.network_id < other.network_id:
-            return -1
-        else:
-            return 1
+        return cmp((self.network_id, self.local_id),
+                   (other.network_id, other.local_id))
 
 def _same_message_struct(this, that):
     """Returns true if the two message structures are the same.
@@ -190,9 +172,7 @@ def _same_message_struct(this, that):
         return False
 
     if this.data_len:
-        this_data = c_data_as_string(this.data, this.data_len)
-        that_data = c_data_as_string(that.data, that.data_len)
-        return this_data == that_data
+        return _message_struct_data(this) == _message_struct_data(that)
     return True
 
 def _equivalent_message_struct(this, that):
@@ -228,11 +208,19 @@ def _equivalent_message_struct(this, that):
         return False
 
     if this.data_len:
-        this_data = c_data_as_string(this.data, this.data_len)
-        that_data = c_data_as_string(that.data, that.data_len)
-        return this_data == that_data
+        return _message_struct_data(this) == _message_struct_data(that)
     return True
 
+def _message_struct_data(msg):
+    """Return the data of a "plain" or "entire" message structure as a string.
+
+    This copies the data out in one go, rather than a byte at a time.
+    """
+    if msg.is_pointy:
+        return ctypes.string_at(msg.data, msg.data_len)
+    else:
+        return ctypes.string_at(ctypes.addressof(msg.rest_data), msg.data_len)
+
 def c_data_as_string(data, data_len):
     """Return the message data as a string.
     """
@@ -387,12 +375,30 @@ def _struct_to_bytes(struct):
     return ctypes.string_at(ctypes.addressof(struct), ctypes.sizeof(struct))
 
 def _struct_from_bytes(struct_class, data):
+    """Return a new instance of 'struct_class', copied from 'data'.
+
+    'data' may be a string or any other object supporting the buffer
+    interface (for instance, a bytearray).
+    """
+    if len(data) >= ctypes.sizeof(struct_class):
+        return struct_class.from_buffer_copy(data)
+    # Otherwise we've been given too little data (typically because the
+    # structure has padding at its end), so copy what we've got and leave
+    # the rest of the structure zeroed
     thing = struct_class()
-    ctypes.memmove(ctypes.addressof(thing), data, ctypes.sizeof(thing))
+    ctypes.memmove(ctypes.addressof(thing), str(data), len(data))
     return thing
 
 MSG_HEADER_LEN = ctypes.sizeof(_MessageHeaderStruct)
 
+# The 32-bit words at the start of a message header, up to and including
+# 'data_len' (so not the name and data pointers, or the end guard). Unpacking
+# these all at once is a lot cheaper than building a _MessageHeaderStruct
+# just to look at a few of its fields.
+_NAME_LEN_WORD = _MessageHeaderStruct.name_len.offset // 4
+_DATA_LEN_WORD = _MessageHeaderStruct.data_len.offset // 4
+_MSG_HEADER_WORDS = struct.Struct('=%dL'%(_DATA_LEN_WORD + 1))
+
 def calc_padded_name_len(name_len):
     """Calculate the length of a message name, in bytes, after padding.
 
@@ -407,6 +413,24 @@ def calc_padded_data_len(data_len):
     """
     return 4 * ((data_len + 3) // 4)
 
+# Most messages are sent to a small set of names, so remember the padded
+# form of the names we have seen (up to a point), rather than padding them
+# out afresh for every message
+_PADDED_NAME_CACHE_MAX = 256
+_padded_name_dict = {}
+
+def _padded_name(name):
+    """Return 'name' with its terminating 0 byte, padded to a multiple of 4.
+    """
+    try:
+        return _padded_name_dict[name]
+    except KeyError:
+        name_len = len(name)
+        padded = name + '\0' * (calc_padded_name_len(name_len) - name_len)
+        if len(_padded_name_dict) < _PADDED_NAME_CACHE_MAX:
+            _padded_name_dict[name] = padded
+        return padded
+
 def calc_entire_message_len(name_len, data_len):
     """Calculate the "entire" message length, from the name and data lengths.
 
@@ -434,36 +458,25 @@ def message_from_parts(id, in_reply_to, to, from_, orig_from, final_to, flags, n
 
     name_len = len(name)
 
-    if data:
-        data_len = len(data)
-    else:
-        data_len = 0
-
-    # C wants us to have a terminating 0 byte
-    name += '\0'
-    # And we want to pad the result out to a multiple of 4 bytes
-    # ...this is about the nastiest way possible of doing it...
-    while len(name)%4:
-        name += '\0'
-
-    padded_name_len = len(name)
-
-    # We want to pad the data out in the same manner
-    # (but without the terminating 0 byte)
-    if data:
-        while len(data)%4:
-            data += '\0'
-        padded_data_len = len(data)
-    else:
-        padded_data_len = 0
+    # C wants us to have a terminating 0 byte, and we want to pad the
+    # result out to a multiple of 4 bytes
+    name = _padded_name(name)
 
     name_ptr = ctypes.c_char_p(name)
+
+    # We want to pad the data out in the same manner (but without the
+    # terminating 0 byte). A new ctypes array starts out zeroed, so we only
+    # need to copy the data itself into it.
     if data:
-        # This seems a bit clumsy and wasteful, but I can't see
-        # how else to do it
-        DataArray = ctypes.c_uint8 * padded_data_len
-        data_ptr = DataArray( *[ord(x) for x in data] )
+        # memmove would happily copy a unicode string as wide characters,
+        # so make sure we've got a (byte) string first
+        data = str(data)
+        data_len = len(data)
+        DataArray = ctypes.c_uint8 * calc_padded_data_len(data_len)
+        data_ptr = DataArray()
+        ctypes.memmove(data_ptr, data, data_len)
     else:
+        data_len = 0
         data_ptr = None
 
     return _MessageHeaderStruct(Message.START_GUARD,
@@ -492,14 +505,36 @@ def _pointy_message_from_bytes(msg_data):
     if h.data_len == 0:
         h.data = None
     else:
-        data = msg_data[data_offset:data_offset+h.data_len]
-
+        # Copy the data straight out of the message bytes
         DataArray = ctypes.c_uint8 * h.data_len
-        h.data = DataArray( *[ord(x) for x in data] )
+        h.data = DataArray.from_buffer_copy(msg_data, data_offset)
 
     final_end_guard = msg_data[data_offset+padded_data_len:]
     return h
 
+def _pointy_message_to_bytes(msg):
+    """Return the "entire" message bytes for a "pointy" message structure.
+
+    The bytes are assembled directly from the header and the name and data it
+    points to, rather than by building an "entire" message structure and
+    then copying the bytes out of that.
+    """
+    name_len = msg.name_len
+    data_len = msg.data_len
+
+    # The "entire" message header does not point to anything
+    header = _MessageHeaderStruct.from_buffer_copy(msg)
+    header.extra = 0
+    header.name = None
+    header.data = None
+
+    parts = [_struct_to_bytes(header), _padded_name(msg.name[:name_len])]
+    if data_len:
+        parts.append(ctypes.string_at(msg.data, data_len))
+        parts.append('\0' * (calc_padded_data_len(data_len) - data_len))
+    parts.append(_END_GUARD_BYTES)
+    return ''.join(parts)
+
 class _EntireMessageStructBaseclass(ctypes.Structure):
     """The baseclass for our "entire" message structure.
 
@@ -521,7 +556,7 @@ class _EntireMessageStructBaseclass(ctypes.Structure):
         else:
             name_repr = 'None'
         if self.data_len:
-            data_repr = repr(hexdata(c_data_as_string(self.rest_data,self.data_len)))
+            data_repr = repr(hexdata(_message_struct_data(self)))
         else:
             data_repr = None
         return "%s %s %s [%08x>"%(
@@ -654,119 +689,50 @@ def _specific_entire_message_struct(padded_name_len, padded_data_len):
         _specific_entire_message_struct_dict[key] = localEntireMessageStruct
         return localEntireMessageStruct
 
-def _entire_message_from_parts(id, in_reply_to, to, from_, orig_from, final_to,
-                               flags, name, data):
-    """Return a new message structure of the correct shape.
-
-    - 'id' and 'in_reply_to' are None or MessageId instance or (network_id,
-      serial_num) tuples
-    - 'to', 'in_reply_to' and 'from_' are 0 or a Ksock id
-    - 'orig_from' and 'final_to' are None or OrigFrom instance or (network_id,
-      local_id) tuple
-    - 'name' is a string
-    - 'data' is a string or None
-
-    Note that the result may be slightly longer than you expect - for instance,
-    on a 64-bit machine, there will be 4 bytes of padding after the final
-    end guard.
-    """
-
-    if id is None:
-        id = MessageId(0,0)
-
-    if in_reply_to is None:
-        in_reply_to = MessageId(0,0)
-
-    if orig_from is None:
-        orig_from = OrigFrom(0,0)
-
-    if final_to is None:
-        final_to = OrigFrom(0,0)
-
-    name_len = len(name)
-
-    if data is None:
-        data = ''
-
-    data_len = len(data)
-
-    # C wants us to have a terminating 0 byte
-    name += '\0'
-    # And we want to pad the result out to a multiple of 4 bytes
-    # ...this is about the nastiest way possible of doing it...
-    while len(name)%4:
-        name += '\0'
-
-    padded_name_len = len(name)
-
-    # We want to pad the data out in the same manner
-    # (but without the terminating 0 byte)
-    while len(data)%4:
-        data += '\0'
-    padded_data_len = len(data)
-
-    header = _MessageHeaderStruct(Message.START_GUARD,
-                                  id, in_reply_to,
-                                  to, from_, orig_from, final_to, 0, flags,
-                                  name_len, data_len,
-                                  None, None, Message.END_GUARD)
-
-    DataArray = ctypes.c_uint8 * padded_data_len
-    data_array = DataArray( *[ord(x) for x in data] )
-
-    # We rather rely on 'data' "disappearing" (being of zero length)
-    # if 'data_len' is zero, and it appears that that just works.
-
-    local_class = _specific_entire_message_struct(padded_name_len,
-                                                  padded_data_len)
-
-    return local_class(header, name, data_array, Message.END_GUARD)
-
-def _entire_message_from_bytes(data):
+def _entire_message_from_bytes(data, length=None):
     """Return a message structure based on 'data'.
 
-    'data' is a string-like object (as, for instance, returned by 'read')
+    'data' is a string-like object (as, for instance, returned by 'read'),
+    or a buffer (such as a bytearray) whose start holds the message.
+
+    If 'length' is given, only the first 'length' bytes of 'data' are
+    message - anything after that (for instance, in a reused read buffer)
+    is ignored.
 
     Note that the result may be slightly longer than you expect - for instance,
     on a 64-bit machine, there will be 4 bytes of padding after the final
     end guard.
     """
+    if length is None:
+        length = len(data)
     # We do *not* want to pass something awful to our C-structure factory!
-    if len(data) < MSG_HEADER_LEN:
+    if length < MSG_HEADER_LEN:
         raise ValueError('Cannot form entire message from string'
-                         ' "%s" of length %d'%(hexdata(data),len(data)))
-    if struct.unpack('=L',data[:4])[0] != Message.START_GUARD:
+                         ' "%s" of length %d'%(hexdata(str(data[:length])),
+                                               length))
+    words = _MSG_HEADER_WORDS.unpack_from(data)
+    if words[0] != Message.START_GUARD:
         raise ValueError('Cannot form entire message from string "%s..%s"'
                          ' which does not start with message start'
-                         ' guard'%(hexdata(data[:8]),hexdata(data[-8:])))
-    ## ===================================
-    debug = False
-    if debug:
-        print
-        print '_entire_message_from_bytes(%d:%s)'%(len(data),hexify(data))
-    ## ===================================
-    h = _struct_from_bytes(_MessageHeaderStruct, data)
-    ## ===================================
-    if debug:
-        print '_MessageHeaderStruct: %s'%h
-    ## ===================================
+                         ' guard'%(hexdata(str(data[:8])),
+                                    hexdata(str(data[length-8:length]))))
+    name_len = words[_NAME_LEN_WORD]
+    data_len = words[_DATA_LEN_WORD]
 
     # Don't forget that the string will be terminated with a 0 byte
-    padded_name_len = calc_padded_name_len(h.name_len)
+    padded_name_len = calc_padded_name_len(name_len)
 
     # But not so the data
-    padded_data_len = calc_padded_data_len(h.data_len)
+    padded_data_len = calc_padded_data_len(data_len)
 
     local_class = _specific_entire_message_struct(padded_name_len,
                                                   padded_data_len)
 
-    ## ===================================
-    if debug:
-        print 'name_len %d -> %d, data_len %d -> %d'%(h.name_len, padded_name_len, h.data_len, padded_data_len)
-        x = _struct_from_bytes(local_class, data)
-        print '_specific_class:      %s'%x
-        print
-    ## ===================================
+    # If we were given less than the whole message, then don't let whatever
+    # follows it in 'data' stand in for the rest
+    if length < len(data) and \
+       length < calc_entire_message_len(name_len, data_len):
+        data = data[:length]
 
     return _struct_from_bytes(local_class, data)
 
@@ -791,6 +757,11 @@ class Message(object):
         >>> msg1
         Message('$.Fred', data='1234')
 
+    Message data is a (byte) string, so (ASCII) unicode data is converted:
+
+        >>> Message('$.Fred', u'dada').data
+        'dada'
+
     A Message can be constructed from another message directly:
 
         >>> msg2 = Message.from_message(msg1)
@@ -965,12 +936,14 @@ class Message(object):
         if not name.startswith('$.'):
             raise ValueError('Message name "%s" does not start "$."'%name)
 
+        # We set the guards ourselves, so the name is all we need to check
+        if len(name) < 3:
+            raise ValueError("Message name is %d long, minimum is 3"
+                             " (e.g., '$.*')"%len(name))
+
         self._from_data(name, data, to, from_, orig_from, final_to,
                         in_reply_to, flags, id)
 
-        # Make sure the result *looks* like a message
-        self._check()
-
     @staticmethod
     def from_message(msg, data=None, to=None, from_=None, orig_from=None,
                      final_to=None, in_reply_to=None, flags=None, id=None):
@@ -989,8 +962,16 @@ class Message(object):
             Message('$.Fred', data='12345678', flags=0x00000001)
         """
         message = Message.__new__(Message,'')
-        message._merge_args(msg.extract(), data, to, from_, orig_from,
-                            final_to, in_reply_to, flags, id)
+        if not msg.msg.is_pointy and data is None and to is None and \
+           from_ is None and orig_from is None and final_to is None and \
+           in_reply_to is None and flags is None and id is None:
+            # A straight copy of an "entire" message (for instance, one we
+            # have just read) can just copy its bytes, rather than taking
+            # it apart and building it again
+            message.msg = type(msg.msg).from_buffer_copy(msg.msg)
+        else:
+            message._merge_args(msg.extract(), data, to, from_, orig_from,
+                                final_to, in_reply_to, flags, id)
         return message
 
     @staticmethod
@@ -1020,9 +1001,12 @@ class Message(object):
         return message
 
     @staticmethod
-    def from_bytes(arg):
+    def from_bytes(arg, length=None):
         """Construct a Message from bytes, as read by the Ksock's 'read_data'.
 
+        If 'length' is given, then only the first 'length' bytes of 'arg'
+        are used.
+
         For instance:
 
             >>> msg1 = Message('$.Fred', '12345678')
@@ -1033,7 +1017,7 @@ class Message(object):
             Message('$.Fred', data='12345678')
         """
         message = Message.__new__(Message,'')
-        message.msg = _entire_message_from_bytes(arg)
+        message.msg = _entire_message_from_bytes(arg, length)
         return message
 
     def _merge_args(self, extracted, this_data, this_to, this_from_,
@@ -1101,19 +1085,6 @@ class Message(object):
                                       orig_from_tuple, final_to_tuple,
                                       flags, name, data)
 
-    def _check(self):
-        """Perform some basic sanity checks on our data.
-        """
-        if self.msg.start_guard != self.START_GUARD:
-            raise ValueError("Message start guard is '%08x', not '%08x'"%\
-                    (self.msg.start_guard, self.START_GUARD))
-        if self.msg.end_guard != self.END_GUARD:
-            raise ValueError("Message end guard is '%08x', not '%08x'"%\
-                    (self.msg.end_guard, self.END_GUARD))
-        if self.msg.name_len < 3:
-            raise ValueError("Message name is %d long, minimum is 3"
-                             " (e.g., '$.*')"%self.msg.name_len)
-
     def __repr__(self):
         (id, in_reply_to, to, from_, orig_from, final_to, flags, name, data) = self.extract()
         args = [repr(name)]
@@ -1302,13 +1273,13 @@ class Message(object):
 
     @property
     def id(self):
-        network_id = self.msg.id.network_id
-        serial_num = self.msg.id.serial_num
-        if network_id == 0 and serial_num == 0:
+        # Only ask our message for the field once - for an "entire" message,
+        # each lookup has to go through to its header
+        id = self.msg.id
+        if id.network_id == 0 and id.serial_num == 0:
             return None
         else:
-            #return MessageId(network_id, serial_num)
-            return self.msg.id
+            return id
 
     @property
     def _id(self):
@@ -1318,13 +1289,11 @@ class Message(object):
 
     @property
     def in_reply_to(self):
-        network_id = self.msg.in_reply_to.network_id
-        serial_num = self.msg.in_reply_to.serial_num
-        if network_id == 0 and serial_num == 0:
+        in_reply_to = self.msg.in_reply_to
+        if in_reply_to.network_id == 0 and in_reply_to.serial_num == 0:
             return None
         else:
-            #return MessageId(network_id, serial_num)
-            return self.msg.in_reply_to
+            return in_reply_to
 
     @property
     def _in_reply_to(self):
@@ -1342,12 +1311,11 @@ class Message(object):
 
     @property
     def orig_from(self):
-        network_id = self.msg.orig_from.network_id
-        local_id   = self.msg.orig_from.local_id
-        if network_id == 0 and local_id == 0:
+        orig_from = self.msg.orig_from
+        if orig_from.network_id == 0 and orig_from.local_id == 0:
             return None
         else:
-            return self.msg.orig_from
+            return orig_from
 
     @property
     def _orig_from(self):
@@ -1357,12 +1325,11 @@ class Message(object):
 
     @property
     def final_to(self):
-        network_id = self.msg.final_to.network_id
-        local_id   = self.msg.final_to.local_id
-        if network_id == 0 and local_id == 0:
+        final_to = self.msg.final_to
+        if final_to.network_id == 0 and final_to.local_id == 0:
             return None
         else:
-            return self.msg.final_to
+            return final_to
 
     @property
     def _final_to(self):
@@ -1383,10 +1350,12 @@ class Message(object):
 
     @property
     def data(self):
-        if self.msg.data_len == 0:
+        msg = self.msg
+        if msg.data_len == 0:
             return None
-        # To be friendly, return data as a Python (byte) string
-        return c_data_as_string(self.msg.data, self.msg.data_len)
+        # To be friendly, return data as a Python (byte) string - copied
+        # straight out of the message datastructure
+        return _message_struct_data(msg)
 
     def extract(self):
         """Return our parts as a tuple.
@@ -1406,26 +1375,23 @@ class Message(object):
 
         This returns the entirety of the message as a Python string.
 
-        In order to do this, it first coerces the mesage to an "entire"
-        message (so that we don't have any dangling "pointers" to the
+        If we are already holding an "entire" message, then its bytes are
+        just copied out directly. Otherwise, it first coerces the mesage to an
+        "entire" message (so that we don't have any dangling "pointers" to the
         name or data).
 
         See the 'total_length()' method for how to determine the "correct"
         length of this string.
         """
-        (id, in_reply_to, to, from_, orig_from, final_to, flags, name, data) = self.extract()
-        tmp = _entire_message_from_parts(id, in_reply_to, to, from_, orig_from,
-                                         final_to, flags, name, data)
-        b = _struct_to_bytes(tmp)
-        # We need to be careful about lengths.
-        # For instance, on a 64-bit machine, there will be 4 bytes of "unused"
-        # padding after the final end guard of an "entire" message, which we
-        # do not want to return. The solution is to return the correct,
-        # calculated, length. Of course, this does cost us a string copy...
-        name_len = len(name) if name else 0
-        data_len = len(data) if data else 0
-        actual_len = calc_entire_message_len(name_len, data_len)
-        return b[:actual_len]
+        if not self.msg.is_pointy:
+            # Our datastructure is already laid out as the message bytes, so
+            # there is no need to take it apart and build it again. Asking
+            # for just the 'total_length()' bytes also means we don't return
+            # any trailing padding.
+            return ctypes.string_at(ctypes.addressof(self.msg),
+                                    self.total_length())
+
+        return _pointy_message_to_bytes(self.msg)
 
     def is_reply(self):
         """A convenience method - are we a Reply?
@@ -1470,6 +1436,9 @@ class Message(object):
             # Otherwise, it's basically an Announcement (at least, that's a good bet)
             return Announcement.from_message(self)
 
+# The end guard that finishes every "entire" message, ready packed
+_END_GUARD_BYTES = struct.pack('=L', Message.END_GUARD)
+
 class Announcement(Message):
     """A "plain" message, needing no reply
 
@@ -2208,19 +2177,23 @@ class _ReplierBindEventHeader(ctypes.Structure):
                 ('binder',  ctypes.c_uint32),
                 ('name_len',ctypes.c_uint32)]
 
+# We only ever want to read the header fields, so there is no need to copy
+# them into a _ReplierBindEventHeader first
+_REPLIER_BIND_EVENT_WORDS = struct.Struct('=3L')
+
 def split_replier_bind_event_data(data):
     """Split the data from a '$.KBUS.ReplierBindEvent' message.
 
     Returns a tuple of the form (is_bind, binder, name)
     """
 
-    hdr = _struct_from_bytes(_ReplierBindEventHeader, data)
+    is_bind, binder, name_len = _REPLIER_BIND_EVENT_WORDS.unpack_from(data)
 
-    offset = ctypes.sizeof(_ReplierBindEventHeader)
+    offset = _REPLIER_BIND_EVENT_WORDS.size
 
-    name = data[offset:offset+hdr.name_len]
+    name = data[offset:offset+name_len]
 
-    return (hdr.is_bind, hdr.binder, name)
+    return (is_bind, binder, name)
 
 if __name__ == "__main__":
     import doctest
@@ -88,20 +88,62 @@ elif POINTER_SIZE == 16:
 else:
     raise Exception('Pointer size is %d, not 32 or 64'%POINTER_SIZE)
 
+def wait_for(condition, timeout=5.0, interval=0.01):
+    """Poll 'condition()' until it is true, or 'timeout' seconds have passed.
+
+    Returns the last value of 'condition()'.
+    """
+    deadline = time.time() + timeout
+    while True:
+        result = condition()
+        if result or time.time() >= deadline:
+            return result
+        time.sleep(interval)
+
+def device_mode(which):
+    """Return the mode of ``/dev/kbus<which>``, or None if it does not exist.
+    """
+    try:
+        return os.stat('/dev/kbus%d'%which).st_mode
+    except OSError:
+        return None
+
+def devices_ready(num_devices):
+    """Are ``/dev/kbus0`` to ``/dev/kbus<num_devices-1>`` all usable?
+
+    That is, do they all exist, with the permissions we expect?
+    """
+    for which in range(num_devices):
+        if device_mode(which) != 020666:
+            return False
+    return True
+
+def wait_for_devices(num_devices):
+    """Wait for ``/dev/kbus0`` to ``/dev/kbus<num_devices-1>`` to be usable.
+
+    Via the magic of hotplugging, loading the KBUS kernel module should cause
+    our devices to exist ...eventually. If the user has done the right magic,
+    they should even have a predictable set of permissions.
+    """
+    wait_for(lambda: devices_ready(num_devices))
+    for which in range(num_devices):
+        assert device_mode(which) == 020666
+
+def devices_gone(num_devices):
+    """Have ``/dev/kbus0`` to ``/dev/kbus<num_devices-1>`` all gone away?
+    """
+    for which in range(num_devices):
+        if os.path.exists('/dev/kbus%d'%which):
+            return False
+    return True
+
 def setup_module():
     # This path assumes that we are running the tests in the ``kbus/python``
     # directory, and that the KBUS kernel module has been built in ``kbus/kbus``.
     retcode = system('sudo insmod ../kbus/kbus.ko kbus_num_devices=%d'%NUM_DEVICES)
     try:
         assert retcode == 0
-        # Via the magic of hotplugging, that should cause our device to exist
-        # ...eventually
-        time.sleep(1)
-        # If the user has done the right magic, it should even have a predictable
-        # set of permissions. We check KBUS 0 because that's the one we should
-        # always find
-        mode = os.stat('/dev/kbus0').st_mode
-        assert mode == 020666
+        wait_for_devices(NUM_DEVICES)
     except:
         system('sudo rmmod kbus')
         raise
@@ -109,10 +151,10 @@ def setup_module():
 def teardown_module():
     retcode = system('sudo rmmod kbus')
     assert retcode == 0
-    # Via the magic of hotplugging, that should cause our device to go away
+    # Via the magic of hotplugging, that should cause our devices to go away
     # ...eventually
-    time.sleep(1)
-    assert not os.path.exists("/dev/kbus0")
+    wait_for(lambda: devices_gone(NUM_DEVICES))
+    assert devices_gone(NUM_DEVICES)
 
 # Let's be good and not use os.system...
 def system(command):
@@ -167,10 +209,8 @@ class BindingsMemory(object):
     def check_bindings(self):
         """Check the bindings we think we have match those of kbus
         """
-        expected = []
-        for ksock, if_list in self.bindings.items():
-            for r, n in if_list:
-                expected.append( (ksock, r, n) )
+        expected = [(ksock, r, n) for ksock, if_list in self.bindings.items()
+                                  for r, n in if_list]
         assert bindings_match(expected)
 
 class RecordingKsock(Ksock):
@@ -200,6 +240,13 @@ class RecordingKsock(Ksock):
         super(RecordingKsock, self).bind(name, replier)
         self.bindings.remember_binding(self, name, replier)
 
+    def bind_many(self, bindings):
+        """A wrapper around the 'bind_many' function, to keep track of bindings.
+        """
+        super(RecordingKsock, self).bind_many(bindings)
+        for name, replier in bindings:
+            self.bindings.remember_binding(self, name, replier)
+
     def unbind(self, name, replier=False):
         """A wrapper around the 'unbind' function, to keep track of bindings.
         """
@@ -233,13 +280,14 @@ def bindings_match(bindings):
     those expected, returns False (and prints out the mismatch) if they do not.
     """
     testwith = []
-    names = {}
+    ksock_ids = {}
     for (fd, rep, name) in bindings:
-        if fd not in names:
-            names[fd] = fd.ksock_id()
-        testwith.append((fd.ksock_id(), rep, name))
+        if fd not in ksock_ids:
+            ksock_ids[fd] = fd.ksock_id()
+        testwith.append((ksock_ids[fd], rep, name))
 
-    actual = read_bindings(names)
+    # We're comparing by Ksock id, so don't want any ids translated to names
+    actual = read_bindings({})
 
     # And compare the two lists - ideally they should match
     # (although we don't want to care about order, I think)
@@ -269,16 +317,17 @@ def check_IOError(expected_errno, fn, *stuff):
     Check that is what happens...
     """
     try:
-        apply(fn, stuff)
+        fn(*stuff)
         # We're not expecting to get here...
         assert False, 'Applying %s%s did not fail with IOError'%(repr(fn), repr(stuff))
     except IOError as e:
         if e.errno:
+            # The assertion message (and thus the errno names) is only worked
+            # out if the assertion fails
             actual_errno = e.errno
-            errno_name = errno.errorcode[actual_errno]
-            expected_errno_name = errno.errorcode[expected_errno]
             assert actual_errno == expected_errno, \
-                    'expected %s, got %s'%(expected_errno_name, errno_name)
+                    'expected %s, got %s'%(errno.errorcode[expected_errno],
+                                           errno.errorcode[actual_errno])
         else:
             # In Python 2.6.5 and after, if a file cannot be written to
             # we don't get EBADF, but instead a "made up" 'File not open
@@ -656,9 +705,9 @@ class TestKernelModule:
             f2 = RecordingKsock(0, 'rw', self.bindings)
             assert f2 != None
             try:
-                f1.bind('$.Fred', False)
-                f1.bind('$.Fred', False)
-                f1.bind('$.Fred', False)
+                f1.bind_many([('$.Fred', False),
+                              ('$.Fred', False),
+                              ('$.Fred', False)])
 
                 f2.bind('$.Jim', False)
 
@@ -670,7 +719,6 @@ class TestKernelModule:
 
                 # Writing to $.Fred on f1 - writes message id N
                 msgF = Message('$.Fred', 'dada')
-                total_length = len(msgF.to_bytes())
 
                 n0 = f1.send_msg(msgF)
 
@@ -679,29 +727,20 @@ class TestKernelModule:
                 n1 = f1.send_msg(msgJ)
                 assert n1 == n0+1
 
-                # Reading f1 - message N
-                length = f1.next_msg()
-                assert length == msgF.total_length()
-                data = f1.read_msg(length)
-                assert n0 == data.id
-
-                # Reading f2 - should be message N+1
-                length = f2.next_msg()
-                assert length == msgJ.total_length()
-                data = f2.read_msg(length)
-                assert data.id == n0+1
-
-                # Reading f1 - should be message N again
-                length = f1.next_msg()
-                assert length == msgF.total_length()
-                data = f1.read_msg(length)
-                assert data.id == n0
-
-                # Reading f1 - should be message N again
-                length = f1.next_msg()
-                assert length == msgF.total_length()
-                data = f1.read_msg(length)
-                assert data.id == n0
+                # Reading f1 should give message N, reading f2 message N+1,
+                # and reading f1 twice more should give message N again each
+                # time (once for each remaining binding to $.Fred)
+                lengthF = msgF.total_length()
+                lengthJ = msgJ.total_length()
+                expected = ((f1, lengthF, n0),
+                            (f2, lengthJ, n0+1),
+                            (f1, lengthF, n0),
+                            (f1, lengthF, n0))
+                for ksock, msg_length, id in expected:
+                    length = ksock.next_msg()
+                    assert length == msg_length
+                    data = ksock.read_msg(length)
+                    assert data.id == id
 
                 # No more messages on f1
                 assert f1.next_msg() == 0
@@ -1453,13 +1492,13 @@ class TestKernelModule:
                     assert f1.next_msg() == 0
 
                     # Or we can write our messsage out in convenient pieces
-                    # Note that (unlike reading) because of the magic of 'flush',
-                    # we can expect to be writing single bytes to our file
-                    # descriptor -- maximally inefficient!
+                    # Note that (unlike reading) 'write_data' goes straight to
+                    # our file descriptor, so we can expect to be writing single
+                    # bytes to it -- maximally inefficient!
                     assert f1.next_msg() == 0
                     data = m.to_bytes()
                     for ch in data:
-                        f0.write_data(ch)        # which also flushes
+                        f0.write_data(ch)        # which is written immediately
                         assert f1.next_msg() == 0
                     f0.send()
                     r = f1.read_next_msg()
@@ -29,7 +29,6 @@
 # ***** END LICENSE BLOCK *****
 
 import errno
-import os
 import select
 import socket
 import subprocess
@@ -41,7 +40,8 @@ from multiprocessing import Process
 from kbus import Ksock, Message, MessageId, Announcement, \
                  Request, Reply, Status, reply_to, stateful_request
 
-from kbus.test.test_kbus import check_IOError
+from kbus.test.test_kbus import check_IOError, wait_for, wait_for_devices, \
+        devices_gone
 
 from kbus.limpet import run_a_limpet, GiveUp, OtherLimpetGoneAway
 
@@ -175,14 +175,7 @@ def setup_module(python_or_c):
     retcode = system('sudo insmod ../../../kbus/kbus.ko kbus_num_devices=%d'%NUM_DEVICES)
     try:
         assert retcode == 0
-        # Via the magic of hotplugging, that should cause our device to exist
-        # ...eventually
-        time.sleep(1)
-        # If the user has done the right magic, it should even have a predictable
-        # set of permissions. We check KBUS 0 because that's the one we should
-        # always find
-        mode = os.stat('/dev/kbus0').st_mode
-        assert mode == 020666
+        wait_for_devices(NUM_DEVICES)
 
         global g_server, g_client
         g_server, g_client = run_limpets(SOCKET_ADDRESS, SOCKET_FAMILY, python_or_c)
@@ -209,10 +202,10 @@ def teardown_module():
 
     retcode = system('sudo rmmod kbus')
     assert retcode == 0
-    # Via the magic of hotplugging, that should cause our device to go away
+    # Via the magic of hotplugging, that should cause our devices to go away
     # ...eventually
-    time.sleep(1)
-    assert not os.path.exists("/dev/kbus0")
+    wait_for(lambda: devices_gone(NUM_DEVICES))
+    assert devices_gone(NUM_DEVICES)
 
 class TestLimpets(object):
 
@@ -42,14 +42,14 @@ try:
                 assert f1.next_msg() == 0
 
                 # Or we can write our messsage out in convenient pieces
-                # Note that (unlike reading) because of the magic of 'flush',
-                # we can expect to be writing single bytes to our file
-                # descriptor -- maximally inefficient!
+                # Note that (unlike reading) 'write_data' goes straight to
+                # our file descriptor, so we can expect to be writing single
+                # bytes to it -- maximally inefficient!
 
                 data = m.to_string()
                 print 'Length',len(data)
                 for ch in data:
-                    f0.write_data(ch)        # which also flushes
+                    f0.write_data(ch)        # which is written immediately
                 f0.send()
                 r = f1.read_next_msg()
                 assert r.equivalent(m)